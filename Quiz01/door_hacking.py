@@ -1,19 +1,425 @@
 # door_hacking.py
+import argparse
+import functools
+import io
 import zipfile
 import itertools
+import multiprocessing
 import string
+import threading
 import time
 from datetime import datetime
 import os # 파일 존재 여부 확인
+import struct
+import zlib
 
-def unlock_zip(zip_file_name="emergency_storage_key.zip"):
+# 선택 의존성 (없으면 순수 파이썬으로 동작)
+#   pip install numpy numba   -> JIT 컴파일된 CPU 배치 검사기
+#   pip install cupy-cuda12x  -> NVIDIA GPU(CUDA) 검사기
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import cupy as cp
+    if cp.cuda.runtime.getDeviceCount() == 0:
+        cp = None
+except Exception:
+    # cupy가 없거나 CUDA 드라이버/GPU를 찾지 못한 경우
+    cp = None
+
+# 후보 문자 순서: 실제 비밀번호에 자주 쓰이는 문자부터 시도
+# (RockYou 등 유출 비밀번호의 문자 빈도 순. 숫자 -> 자주 쓰는 소문자 순)
+# 전체 조합 수는 같고, 흔한 암호일수록 더 일찍 찾게 된다.
+DEFAULT_CHARSET = "1023456789easionrltcdmphubkgyfvjwzxq"
+
+BATCH_SIZE = 1_000_000 # numba 검사기에 한 번에 넘길 후보 개수
+CUDA_BLOCKS = 65536 # CUDA 커널 한 번 실행 시 블록 수
+CUDA_THREADS = 256 # 블록당 스레드 수 (한 번에 65536*256개 후보 검사)
+CUDA_MAX_HITS = 1 << 20 # 커널 한 번에 기록할 헤더 통과 후보의 최대 개수 (평균 약 1/256)
+PREFIX_LENGTH = 2 # 병렬 검색 시 앞 2글자(36x36=1296개)로 작업을 나눔
+STATUS_INTERVAL = 2.0 # 병렬 검색 진행 상황 출력 주기(초)
+
+# ---------------- ZipCrypto 헤더 검사 ----------------
+# zipfile 모듈을 거치지 않고 12바이트 암호화 헤더만 직접 복호화해서
+# 검사 바이트(check byte)가 맞는 후보만 zipfile로 최종 확인한다.
+def _make_crc_table():
+    table = []
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        table.append(c)
+    return table
+
+_CRC_TABLE = _make_crc_table()
+_INIT_KEYS = (0x12345678, 0x23456789, 0x34567890)
+
+def _read_zipcrypto_header(zip_data, info):
+    """메모리에 읽어 둔 ZIP(zip_data)에서 멤버의 12바이트 암호화 헤더와 검사 바이트를 꺼낸다."""
+    offset = info.header_offset
+    fheader = struct.unpack_from(zipfile.structFileHeader, zip_data, offset)
+    offset += zipfile.sizeFileHeader + fheader[zipfile._FH_FILENAME_LENGTH] + fheader[zipfile._FH_EXTRA_FIELD_LENGTH]
+    header = bytes(zip_data[offset:offset + 12])
+    # 데이터 디스크립터를 쓰는 경우 CRC 대신 수정 시간의 상위 바이트로 검사
+    if info.flag_bits & 0x08:
+        check_byte = (info._raw_time >> 8) & 0xFF
+    else:
+        check_byte = (info.CRC >> 24) & 0xFF
+    return header, check_byte
+
+def _update_keys(k0, k1, k2, c):
+    """ZipCrypto 키 상태에 평문 1바이트를 반영"""
+    table = _CRC_TABLE
+    k0 = (k0 >> 8) ^ table[(k0 ^ c) & 0xFF]
+    k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+    k2 = (k2 >> 8) ^ table[(k2 ^ (k1 >> 24)) & 0xFF]
+    return k0, k1, k2
+
+def _zipcrypto_check(header, check_byte, keys):
+    """암호를 넣은 뒤의 키 상태(keys)로 12바이트 헤더를 복호화했을 때
+    마지막 바이트가 검사 바이트와 같은지 확인"""
+    table = _CRC_TABLE
+    k0, k1, k2 = keys
+    for c in header:
+        t = k2 | 2
+        c ^= ((t * (t ^ 1)) >> 8) & 0xFF
+        k0 = (k0 >> 8) ^ table[(k0 ^ c) & 0xFF]
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = (k2 >> 8) ^ table[(k2 ^ (k1 >> 24)) & 0xFF]
+    return c == check_byte
+
+def _try_password(zf, names, pw):
+    """헤더 검사를 통과한 후보를 실제 복호화(CRC 확인 포함)로 최종 확인
+
+    names는 암호가 걸린 멤버 이름들(작은 것부터). 아주 작은 멤버는 CRC가 우연히 맞을 수 있어
+    (예: 2바이트 stored 파일은 약 1/65536) 모든 멤버를 확인해야 extractall이 실패하지 않음
+    """
+    try:
+        for name in names:
+            zf.read(name, pwd=pw)
+    except (RuntimeError, zipfile.BadZipFile, zlib.error):
+        # 암호가 틀린 경우 (헤더 검사를 우연히 통과해도 CRC/압축 해제에서 걸러짐)
+        return False
+    return True
+
+def _print_progress(attempt_count, start_time):
+    elapsed_time = time.time() - start_time
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 시도 중... {attempt_count:,}번째 | 경과 시간: {elapsed_time:.2f}초")
+
+def _iter_passwords(alphabet, pw, start=0):
+    """pw[:start]는 고정(접두어)하고 뒤의 모든 조합을 itertools.product 순서로 만들어 (pw, keys)로 내보냄.
+    매번 새 문자열을 만들지 않고 넘겨받은 bytearray pw를 자리올림 카운터처럼 그 자리에서 고친다
+    (보관하려면 bytes(pw)로 복사할 것).
+    keys는 pw를 모두 넣은 뒤의 ZipCrypto 키 상태로, 자리별 중간 상태를 저장해 두고
+    바뀐 자리부터만 다시 계산한다 (대부분 맨 끝 한 자리만 계산, 평균 약 1.03자리)."""
+    password_length = len(pw)
+    pw[start:] = alphabet[:1] * (password_length - start)
+    digits = [0] * password_length
+    last = len(alphabet) - 1
+    first_char = alphabet[0]
+    # states[i] = 앞의 i글자를 넣은 뒤의 키 상태
+    states = [_INIT_KEYS] * (password_length + 1)
+    for i in range(password_length):
+        states[i + 1] = _update_keys(*states[i], pw[i])
+    while True:
+        yield pw, states[password_length]
+        # 맨 끝 자리부터 1 증가, 마지막 문자를 넘으면 앞자리로 자리올림
+        pos = password_length - 1
+        while pos >= start and digits[pos] == last:
+            digits[pos] = 0
+            pw[pos] = first_char
+            pos -= 1
+        if pos < start:
+            return
+        digits[pos] += 1
+        pw[pos] = alphabet[digits[pos]]
+        for i in range(pos, password_length):
+            states[i + 1] = _update_keys(*states[i], pw[i])
+
+def _password_index(pw, index_of, start=0):
+    """pw[start:]가 그 접두어 안에서 몇 번째(0부터) 조합인지 계산 (진행 상황 표시용)"""
+    base = len(index_of)
+    n = 0
+    for c in pw[start:]:
+        n = n * base + index_of[c]
+    return n
+
+def _start_reporter(report, interval=STATUS_INTERVAL):
+    """interval초마다 report()를 부르는 데몬 스레드 시작. 멈출 때는 돌려받은 Event를 set()"""
+    done = threading.Event()
+    def run():
+        while not done.wait(interval):
+            report()
+    threading.Thread(target=run, daemon=True).start()
+    return done
+
+def _search_python(zf, names, header, check_byte, chars, password_length, start_time):
+    """순수 파이썬으로 한 후보씩 검사. (찾은 암호(bytes) 또는 None, 시도 횟수) 반환"""
+    alphabet = chars.encode('ascii')
+    index_of = {c: i for i, c in enumerate(alphabet)}
+    pw = bytearray(password_length)
+
+    # 진행 상황은 별도 스레드가 현재 후보(pw)를 읽어서 출력 -> 검사 루프에는 카운터/분기 없음
+    done = _start_reporter(lambda: _print_progress(_password_index(pw, index_of) + 1, start_time))
+    try:
+        # 가능한 모든 암호 조합 생성 및 시도
+        for pw, keys in _iter_passwords(alphabet, pw):
+            # 틀린 암호는 대부분(255/256) 헤더 검사에서 바로 걸러짐
+            if _zipcrypto_check(header, check_byte, keys) and _try_password(zf, names, bytes(pw)):
+                return bytes(pw), _password_index(pw, index_of) + 1
+    finally:
+        done.set()
+    return None, len(chars)**password_length
+
+def _search_worker(worker_id, zip_data, names, header, check_byte, chars, password_length,
+                   prefix_queue, stop_event, progress, result):
+    """prefix_queue에서 접두어를 하나씩 꺼내 그 뒤의 조합을 검사하는 작업 프로세스.
+    progress[worker_id]에는 이 프로세스의 누적 시도 횟수를 기록한다."""
+    alphabet = chars.encode('ascii')
+    index_of = {c: i for i, c in enumerate(alphabet)}
+    pw = bytearray(password_length)
+    state = {"done": 0, "start": 0} # 끝낸 접두어들의 시도 횟수, 현재 접두어 길이
+
+    # 누적 시도 횟수는 스레드가 주기적으로 pw를 읽어 기록 -> 검사 루프는 그대로
+    def report():
+        progress[worker_id] = state["done"] + _password_index(pw, index_of, state["start"])
+    reporter = _start_reporter(report, STATUS_INTERVAL / 2)
+
+    # ZipFile 객체는 프로세스 간에 공유하지 않고 각자 연다
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zf:
+        while True:
+            prefix = prefix_queue.get()
+            if prefix is None:
+                break
+            start = len(prefix)
+            pw[:start] = prefix.encode('ascii')
+            state["start"] = start
+            for pw, keys in _iter_passwords(alphabet, pw, start):
+                if _zipcrypto_check(header, check_byte, keys) and _try_password(zf, names, bytes(pw)):
+                    reporter.set()
+                    progress[worker_id] = state["done"] + _password_index(pw, index_of, start) + 1
+                    result["password"] = bytes(pw)
+                    stop_event.set()
+                    return
+            state["done"] += len(alphabet)**(password_length - start)
+    reporter.set()
+    progress[worker_id] = state["done"]
+
+def _search_parallel(zf, names, header, check_byte, chars, password_length, start_time, *, zip_data):
+    """앞 글자로 키 공간을 나눠 CPU 코어 수만큼 프로세스로 검사. (찾은 암호(bytes) 또는 None, 시도 횟수) 반환
+    각 프로세스는 zip_data(ZIP 파일 내용)로 자기 ZipFile을 만든다."""
+    workers = os.cpu_count() or 1
+    prefix_length = min(PREFIX_LENGTH, password_length)
+    prefix_queue = multiprocessing.Queue()
+    for attempt in itertools.product(chars, repeat=prefix_length):
+        prefix_queue.put("".join(attempt))
+    for _ in range(workers):
+        prefix_queue.put(None) # 작업 끝 표시
+    stop_event = multiprocessing.Event()
+    progress = multiprocessing.Array('Q', workers, lock=False) # 프로세스별 누적 시도 횟수
+
+    with multiprocessing.Manager() as manager:
+        result = manager.dict()
+        procs = [
+            multiprocessing.Process(
+                target=_search_worker,
+                args=(worker_id, zip_data, names, header, check_byte, chars, password_length,
+                      prefix_queue, stop_event, progress, result),
+                daemon=True,
+            )
+            for worker_id in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+
+        # 작업 프로세스들의 누적 시도 횟수와 초당 시도 횟수를 주기적으로 출력
+        def report_status():
+            attempt_count = sum(progress)
+            rate = attempt_count / max(time.time() - start_time, 1e-9)
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 시도 중... {attempt_count:,}번째 | 초당 {rate:,.0f}회 | 프로세스 {workers}개")
+        done = _start_reporter(report_status)
+
+        try:
+            # 누군가 암호를 찾거나(stop_event) 모든 프로세스가 끝날 때까지 대기
+            while not stop_event.wait(0.2):
+                if not any(proc.is_alive() for proc in procs):
+                    break
+        finally:
+            done.set()
+            # 나머지 프로세스는 검사 루프 안에서 멈춤 여부를 확인하지 않으므로 여기서 종료
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+            for proc in procs:
+                proc.join()
+        password = result.get("password")
+    return password, sum(progress)
+
+if njit is not None:
+    # 모듈 전역 배열은 numba가 컴파일 시 상수로 고정 (호출마다 인자로 넘기지 않음, 1 KiB라 L1에 상주)
+    _CRC_TABLE_NP = np.array(_CRC_TABLE, dtype=np.uint32)
+
+    @njit(parallel=True, cache=True)
+    def _zipcrypto_check_batch(cands, header, check_byte, hits):
+        """cands[i] (uint8 [N, 길이])마다 헤더 검사 결과를 hits[i]에 기록"""
+        table = _CRC_TABLE_NP
+        for i in prange(cands.shape[0]):
+            k0 = 0x12345678
+            k1 = 0x23456789
+            k2 = 0x34567890
+            for j in range(cands.shape[1]):
+                k0 = (k0 >> 8) ^ table[(k0 ^ cands[i, j]) & 0xFF]
+                k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+                k2 = (k2 >> 8) ^ table[(k2 ^ (k1 >> 24)) & 0xFF]
+            c = 0
+            for j in range(12):
+                t = k2 | 2
+                c = header[j] ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+                k0 = (k0 >> 8) ^ table[(k0 ^ c) & 0xFF]
+                k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+                k2 = (k2 >> 8) ^ table[(k2 ^ (k1 >> 24)) & 0xFF]
+            hits[i] = c == check_byte
+
+    def _fill_candidates(cands, start, count, chars_arr):
+        """start번째 조합부터 count개를 36진 카운터처럼 cands에 채움 (itertools.product 순서와 동일)"""
+        idx = np.arange(start, start + count, dtype=np.int64)
+        base = len(chars_arr)
+        for pos in range(cands.shape[1] - 1, -1, -1):
+            cands[:count, pos] = chars_arr[idx % base]
+            idx //= base
+
+    def _search_numba(zf, names, header, check_byte, chars, password_length, start_time):
+        """BATCH_SIZE개씩 묶어서 JIT 검사기로 검사. (찾은 암호(bytes) 또는 None, 시도 횟수) 반환"""
+        chars_arr = np.frombuffer(chars.encode('ascii'), dtype=np.uint8)
+        header_arr = np.frombuffer(header, dtype=np.uint8)
+        total_combinations = len(chars)**password_length
+        cands = np.empty((BATCH_SIZE, password_length), dtype=np.uint8)
+        hits = np.empty(BATCH_SIZE, dtype=np.bool_)
+
+        for start in range(0, total_combinations, BATCH_SIZE):
+            count = min(BATCH_SIZE, total_combinations - start)
+            _fill_candidates(cands, start, count, chars_arr)
+            _zipcrypto_check_batch(cands[:count], header_arr, check_byte, hits[:count])
+            # 헤더 검사를 통과한 후보(약 1/256)만 zipfile로 확인
+            for i in np.flatnonzero(hits[:count]):
+                pw = cands[i].tobytes()
+                if _try_password(zf, names, pw):
+                    return pw, start + int(i) + 1
+            _print_progress(start + count, start_time)
+        return None, total_combinations
+
+class _CudaUnavailable(Exception):
+    """CUDA 커널을 컴파일/실행할 수 없음 (다음 검사기로 전환)"""
+
+if cp is not None:
+    # 스레드 하나가 후보 하나를 맡음: (base_index + tid)를 36진수로 바꿔 암호를 만들고
+    # 12바이트 헤더 검사를 통과하면 hits에 인덱스를 기록
+    _CUDA_SOURCE = r"""
+    __constant__ unsigned int CRC_TABLE[256];
+
+    #define UPDATE_KEYS(c) \
+        k0 = (k0 >> 8) ^ CRC_TABLE[(k0 ^ (c)) & 0xFF]; \
+        k1 = (k1 + (k0 & 0xFF)) * 134775813u + 1u; \
+        k2 = (k2 >> 8) ^ CRC_TABLE[(k2 ^ (k1 >> 24)) & 0xFF];
+
+    extern "C" __global__
+    void zipcrypto_check(const unsigned char* header, unsigned char check_byte,
+                         unsigned long long base_index, unsigned long long total,
+                         const unsigned char* charset, int charset_len, int pw_len,
+                         unsigned long long* hits, unsigned int* hit_count, unsigned int max_hits)
+    {
+        unsigned long long idx = base_index + (unsigned long long)blockIdx.x * blockDim.x + threadIdx.x;
+        if (idx >= total) return;
+
+        unsigned char pw[16];
+        unsigned long long n = idx;
+        for (int i = pw_len - 1; i >= 0; --i) {
+            pw[i] = charset[n % charset_len];
+            n /= charset_len;
+        }
+
+        unsigned int k0 = 0x12345678u, k1 = 0x23456789u, k2 = 0x34567890u;
+        for (int i = 0; i < pw_len; ++i) {
+            UPDATE_KEYS(pw[i]);
+        }
+        unsigned char c = 0;
+        for (int j = 0; j < 12; ++j) {
+            unsigned int t = k2 | 2u;
+            c = header[j] ^ (unsigned char)((t * (t ^ 1u)) >> 8);
+            UPDATE_KEYS(c);
+        }
+        if (c == check_byte) {
+            unsigned int slot = atomicAdd(hit_count, 1u);
+            if (slot < max_hits) hits[slot] = idx;
+        }
+    }
+    """
+
+    def _index_to_password(idx, alphabet, pw):
+        """idx번째 조합(itertools.product 순서)을 bytearray pw에 그대로 써 넣음"""
+        base = len(alphabet)
+        for pos in range(len(pw) - 1, -1, -1):
+            idx, digit = divmod(idx, base)
+            pw[pos] = alphabet[digit]
+
+    def _search_cuda(zf, names, header, check_byte, chars, password_length, start_time):
+        """GPU에서 CUDA_BLOCKS*CUDA_THREADS개씩 검사. (찾은 암호(bytes) 또는 None, 시도 횟수) 반환"""
+        alphabet = chars.encode('ascii')
+        pw = bytearray(password_length) # 헤더 통과 후보를 확인할 때 재사용
+        # 커널 컴파일(NVRTC)이나 GPU 메모리 준비가 실패하면 다른 검사기로 넘어가도록 알림
+        try:
+            module = cp.RawModule(code=_CUDA_SOURCE)
+            kernel = module.get_function("zipcrypto_check")
+            # CRC 표(1 KiB)는 상수 메모리에 한 번만 올려 둠
+            table_d = cp.ndarray((256,), cp.uint32, module.get_global("CRC_TABLE"))
+            table_d[...] = cp.asarray(_CRC_TABLE, dtype=cp.uint32)
+            header_d = cp.asarray(np.frombuffer(header, dtype=np.uint8))
+            charset_d = cp.asarray(np.frombuffer(alphabet, dtype=np.uint8))
+            hits_d = cp.empty(CUDA_MAX_HITS, dtype=cp.uint64)
+            hit_count_d = cp.zeros(1, dtype=cp.uint32)
+        except Exception as e:
+            raise _CudaUnavailable(e) from e
+
+        total_combinations = len(chars)**password_length
+        per_launch = CUDA_BLOCKS * CUDA_THREADS
+        for base_index in range(0, total_combinations, per_launch):
+            try:
+                hit_count_d.fill(0)
+                kernel((CUDA_BLOCKS,), (CUDA_THREADS,),
+                       (header_d, np.uint8(check_byte), np.uint64(base_index), np.uint64(total_combinations),
+                        charset_d, np.int32(len(chars)), np.int32(password_length),
+                        hits_d, hit_count_d, np.uint32(CUDA_MAX_HITS)))
+                hit_count = min(int(hit_count_d.get()[0]), CUDA_MAX_HITS)
+                # 스레드 실행 순서는 제각각이므로 인덱스 순으로 정렬해서 확인
+                hits = sorted(hits_d[:hit_count].get().tolist())
+            except Exception as e:
+                raise _CudaUnavailable(e) from e
+            for idx in hits:
+                _index_to_password(idx, alphabet, pw)
+                if _try_password(zf, names, bytes(pw)):
+                    return bytes(pw), idx + 1
+            _print_progress(min(base_index + per_launch, total_combinations), start_time)
+        return None, total_combinations
+
+def unlock_zip(zip_file_name="emergency_storage_key.zip", chars=DEFAULT_CHARSET):
     base_dir = os.path.dirname(os.path.abspath(__file__))
     zip_file_path = os.path.join(base_dir, zip_file_name)
     print("ZIP 파일 암호 풀기 시작!")
     print(f"목표 파일: {zip_file_path}")
 
-    # 암호에 사용될 문자 정의 (소문자 알파벳, 숫자)
-    chars = string.ascii_lowercase + string.digits
+    # 암호에 사용될 문자 (소문자 알파벳, 숫자) - chars는 시도할 순서
+    if not chars.isascii() or len(set(chars)) != len(chars):
+        print("오류: 문자 집합은 중복 없는 ASCII 문자여야 합니다.")
+        return False
+    if set(chars) != set(string.ascii_lowercase + string.digits):
+        print("참고: 문자 집합이 소문자 알파벳+숫자 전체와 다릅니다.")
     password_length = 6
 
     print(f"암호는 {password_length}자리 숫자와 소문자 알파벳으로 구성됩니다.")
@@ -27,26 +433,61 @@ def unlock_zip(zip_file_name="emergency_storage_key.zip"):
         print("파일 경로를 확인하거나 같은 폴더에 파일을 넣어주세요.")
         return
 
-    attempt_count = 0
-    start_time = time.time()
-
-    # 가능한 모든 암호 조합 생성 및 시도
-    for attempt in itertools.product(chars, repeat=password_length):
-        password = "".join(attempt) # 조합된 문자로 암호 문자열 생성
-        attempt_count += 1
+    # ZIP 파일은 루프 밖에서 한 번만 메모리로 읽어 열고, 가장 작은 멤버 하나로만 암호를 검사
+    # (이후 검사 중에는 디스크 I/O 없음)
+    with open(zip_file_path, 'rb') as f:
+        zip_data = f.read()
+    try:
+        zf = zipfile.ZipFile(io.BytesIO(zip_data), 'r')
+    except zipfile.BadZipFile:
+        # ZIP 파일이 손상된 경우
+        print(f"경고: '{zip_file_path}' 파일이 유효한 ZIP 파일이 아닙니다.")
+        return False
 
-        # 일정 시도마다 진행 상황 출력
-        if attempt_count % 100000 == 0:
-            elapsed_time = time.time() - start_time
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] 시도 중... {attempt_count:,}번째 | 경과 시간: {elapsed_time:.2f}초")
+    with zf:
+        members = [info for info in zf.infolist() if not info.is_dir()]
+        if not members:
+            print(f"경고: '{zip_file_path}' 안에 파일이 없습니다.")
+            return False
+        # 암호가 걸린 멤버 중 가장 작은 것으로 검사 (암호 없는 멤버가 섞여 있어도 됨)
+        encrypted = sorted((info for info in members if info.flag_bits & 0x01), key=lambda info: info.file_size)
+        if not encrypted:
+            print(f"경고: '{zip_file_path}' 안에 암호가 걸린 파일이 없습니다.")
+            return False
+        info = encrypted[0]
+        names = tuple(info.filename for info in encrypted)
+        header, check_byte = _read_zipcrypto_header(zip_data, info)
 
+        # GPU가 있으면 CUDA를 먼저 시도하고, CPU는 numba가 있으면 JIT 배치 검사(이미 모든 코어 사용),
+        # 없으면 프로세스 병렬 검사
+        searches = []
+        if cp is not None:
+            searches.append(_search_cuda)
+        if njit is not None:
+            searches.append(_search_numba)
+        elif (os.cpu_count() or 1) > 1:
+            searches.append(functools.partial(_search_parallel, zip_data=zip_data))
+        else:
+            searches.append(_search_python)
         try:
-            # zip 파일 암호 해제 시도
-            with zipfile.ZipFile(zip_file_path, 'r') as zf:
-                zf.extractall(pwd=password.encode('utf-8'))
-            
-            # 암호 찾기 성공 시
-            elapsed_time = time.time() - start_time
+            for search in searches:
+                start_time = time.time()
+                try:
+                    password, attempt_count = search(zf, names, header, check_byte, chars, password_length, start_time)
+                    break
+                except _CudaUnavailable as e:
+                    # CUDA 커널 컴파일/실행 실패 -> 다음(CPU) 검사기로 처음부터 다시 검사
+                    print(f"GPU(CUDA) 검사를 사용할 수 없어 CPU 검사로 전환합니다: {e}")
+        except Exception as e:
+            # 그 외 알 수 없는 오류 발생 시
+            print(f"알 수 없는 오류가 발생했어요: {e}")
+            return False
+        elapsed_time = time.time() - start_time
+
+        if password is not None:
+            # 암호 찾기 성공 시: 실제 압축 해제는 여기서 한 번만
+            zf.extractall(pwd=password)
+            password = password.decode('ascii') # 출력/저장용 문자열은 마지막에 한 번만 만듦
             print("\n암호를 찾았습니다!")
             print(f"찾아낸 암호: {password}")
             print(f"총 시도 횟수: {attempt_count:,}번")
@@ -58,24 +499,19 @@ def unlock_zip(zip_file_name="emergency_storage_key.zip"):
             print("찾은 암호가 'password.txt' 파일에 저장되었습니다.")
             return True
 
-        except RuntimeError:
-            # 암호가 틀린 경우 (에러 무시, 다음 암호 시도)
-            pass
-        except zipfile.BadZipFile:
-            # ZIP 파일이 손상된 경우
-            print(f"경고: '{zip_file_path}' 파일이 유효한 ZIP 파일이 아닙니다.")
-            return False
-        except Exception as e:
-            # 그 외 알 수 없는 오류 발생 시
-            print(f"알 수 없는 오류가 발생했어요: {e}")
-            return False
-
     # 모든 조합을 시도했지만 암호를 찾지 못한 경우
-    elapsed_time = time.time() - start_time
     print("\n모든 암호를 시도했지만 찾지 못했습니다.")
     print(f"총 시도 횟수: {attempt_count:,}번 | 총 소요 시간: {elapsed_time:.2f}초")
     return False
 
 # 스크립트 실행 시 unlock_zip 함수 호출
+#   python door_hacking.py                             # 기본 (빈도순 문자 집합)
+#   python door_hacking.py --charset-order abc...xyz0123456789
 if __name__ == "__main__":
-    unlock_zip()
+    parser = argparse.ArgumentParser(description="6자리(소문자+숫자) ZIP 암호 찾기")
+    parser.add_argument("zip", nargs="?", default="emergency_storage_key.zip",
+                        help="스크립트 폴더 기준 ZIP 파일 이름 (기본: emergency_storage_key.zip)")
+    parser.add_argument("--charset-order", default=DEFAULT_CHARSET,
+                        help=f"시도할 문자 순서 (기본: {DEFAULT_CHARSET})")
+    args = parser.parse_args()
+    unlock_zip(args.zip, chars=args.charset_order)
@@ -3,13 +3,30 @@
 # 이번 과제 요구: 버튼 클릭 시 표시창에 입력만 되도록, 실제 계산 기능은 구현하지 않음.
 
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QGridLayout, QPushButton, QLineEdit, QSizePolicy
+    QApplication, QWidget, QGridLayout, QPushButton, QLineEdit, QSizePolicy, QButtonGroup
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 import sys
 
 class CalculatorUI(QWidget):
+    BTN_CURSOR = Qt.CursorShape.PointingHandCursor
+
+    # Root stylesheet: parsed once for the whole window.
+    # Buttons are matched by their "role" property (op / func / digit).
+    STYLE_SHEET = """
+        * { background: #000; }
+        QPushButton[role="op"] {
+            background: #f39c12; color: white; border: none; border-radius: 12px;
+        } QPushButton[role="op"]:pressed { filter: brightness(85%); }
+        QPushButton[role="func"] {
+            background: #a5a5a5; color: black; border: none; border-radius: 12px;
+        } QPushButton[role="func"]:pressed { filter: brightness(90%); }
+        QPushButton[role="digit"] {
+            background: #333; color: white; border: none; border-radius: 12px;
+        } QPushButton[role="digit"]:pressed { filter: brightness(85%); }
+    """
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Calculator (iPhone-like Layout)")
@@ -52,33 +69,23 @@ class CalculatorUI(QWidget):
             ["0", ".", "="],  # 0은 두 칸(span 2)
         ]
 
-        # Helper to create a button
+        # All buttons share one click signal: the group passes the clicked button
+        self.buttons = QButtonGroup(self)
+        self.buttons.setExclusive(False)
+        self.buttons.buttonClicked.connect(self._on_button_clicked)
+
+        # Helper to create a button (font/cursor/style shared by all buttons)
+        btn_font = QFont("Segoe UI", 16)
+
         def make_btn(text, role="digit"):
             btn = QPushButton(text)
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setCursor(self.BTN_CURSOR)
             btn.setMinimumHeight(56)
-            btn.setFont(QFont("Segoe UI", 16))
-
-            # Style by role (roughly mimicking iPhone palette)
-            if role == "op":
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background: #f39c12; color: white; border: none; border-radius: 12px;
-                    } QPushButton:pressed { filter: brightness(85%); }
-                """)
-            elif role == "func":
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background: #a5a5a5; color: black; border: none; border-radius: 12px;
-                    } QPushButton:pressed { filter: brightness(90%); }
-                """)
-            else:  # digit
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background: #333; color: white; border: none; border-radius: 12px;
-                    } QPushButton:pressed { filter: brightness(85%); }
-                """)
-            btn.clicked.connect(lambda _, t=text: self.on_button(t))
+            btn.setFont(btn_font)
+
+            # Style by role (roughly mimicking iPhone palette), see STYLE_SHEET
+            btn.setProperty("role", role)
+            self.buttons.addButton(btn)
             return btn
 
         # Place buttons in grid
@@ -105,9 +112,12 @@ class CalculatorUI(QWidget):
                 grid.addWidget(make_btn(".", "digit"), idx, 2)
                 grid.addWidget(make_btn("=", "op"), idx, 3)
 
-        self.setStyleSheet("background: #000;")
+        self.setStyleSheet(self.STYLE_SHEET)
         self.setFixedWidth(360)
 
+    def _on_button_clicked(self, btn: QPushButton):
+        self.on_button(btn.text())
+
     def on_button(self, label: str):
         # Only input behavior (no real calculation)
         if label == "AC":
@@ -4,10 +4,10 @@
 # - Implements: add, subtract, multiply, divide, reset, negative_positive, percent, equal
 # - Digits accumulate, single decimal point handled.
 
-from PyQt6.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLineEdit, QSizePolicy
+from PyQt6.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLineEdit, QSizePolicy, QButtonGroup
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
-import sys
+import sys, math
 
 class Calculator:
     """
@@ -22,53 +22,99 @@ class Calculator:
 
     def reset(self):
         self.acc = 0.0            # accumulator
-        self.current = "0"        # current input as string
+        self._new_entry()         # current input as string (+ its numeric value)
         self.pending_op = None    # one of ('+', '-', '×', '÷')
         self.just_evaluated = False
         self.update_display(self.current)
 
     # Helper conversions
-    def _current_value(self):
+    # While the user is typing, the number is also kept as an integer mantissa
+    # and a count of fraction digits, so its value is updated per keypress
+    # instead of re-parsing the whole string. mantissa / 10**frac_digits is
+    # correctly rounded, i.e. the same float that float(self.current) gives.
+    def _new_entry(self):
+        self.current = "0"
+        self._typed = True        # current was built by input_digit/input_dot
+        self._mantissa = 0
+        self._frac_digits = None  # None until a dot is entered
+        self._negative = False
+        self._value = 0.0         # cached float(self.current); None = parse lazily
+
+    def _typed_value(self) -> float:
         try:
-            return float(self.current)
-        except ValueError:
-            return 0.0
+            val = self._mantissa / 10 ** (self._frac_digits or 0)
+        except OverflowError:
+            val = math.inf  # same as float() of a ~309+ digit string
+        return -val if self._negative else val
+
+    def _current_value(self):
+        if self._value is None:
+            try:
+                self._value = float(self.current)
+            except ValueError:
+                self._value = 0.0
+        return self._value
 
     def _set_current_from_value(self, val: float):
         # Trim trailing .0
         text = f"{val:.12g}"  # avoid scientific notation for typical range
         self.current = text
+        self._typed = False       # value comes from the rounded text, parse on demand
+        self._value = None
         self.update_display(self.current)
 
     # Number & dot inputs
     def input_digit(self, d: str):
         if self.just_evaluated and self.pending_op is None:
             # Start new entry after equals
-            self.current = "0"
+            self._new_entry()
             self.just_evaluated = False
 
+        digit = ord(d) - 48
         if self.current == "0":
             self.current = d
+            self._typed = True
+            self._mantissa, self._frac_digits, self._negative = digit, None, False
+            self._value = float(digit)
         else:
             self.current += d
+            if self._typed:
+                self._mantissa = self._mantissa * 10 + digit
+                if self._frac_digits is not None:
+                    self._frac_digits += 1
+                self._value = self._typed_value()
+            else:
+                self._value = None
         self.update_display(self.current)
 
     def input_dot(self):
         if self.just_evaluated and self.pending_op is None:
-            self.current = "0"
+            self._new_entry()
             self.just_evaluated = False
 
         if "." not in self.current:
             self.current += "." if self.current else "0."
+            if self._typed:
+                self._frac_digits = 0
+            else:
+                self._value = None  # e.g. "6e-07." no longer parses
             self.update_display(self.current)
 
     # Sign toggle
     def negative_positive(self):
+        toggled = True
         if self.current.startswith("-"):
             self.current = self.current[1:] or "0"
+        elif self.current != "0":
+            self.current = "-" + self.current
         else:
-            if self.current != "0":
-                self.current = "-" + self.current
+            toggled = False
+        if toggled:
+            if self._typed:
+                self._negative = not self._negative
+                self._value = self._typed_value()
+            else:
+                self._value = None
         self.update_display(self.current)
 
     # Percent behavior similar to iOS:
@@ -104,6 +150,7 @@ class Calculator:
                 return
         except ZeroDivisionError:
             self.current = "Error"
+            self._typed, self._value = False, None
             self.acc = 0.0
             self.pending_op = None
             self.just_evaluated = True
@@ -123,14 +170,14 @@ class Calculator:
             self.acc = self._current_value()
             self.pending_op = op_symbol
             self.just_evaluated = False
-            self.current = "0"
+            self._new_entry()
         else:
             # Chain: apply pending op with current, then set new op
             status = self._apply_pending()
             if status == "error":
                 return
             self.pending_op = op_symbol
-            self.current = "0"
+            self._new_entry()
             self.just_evaluated = False
 
     def add(self): self._press_operator("+")
@@ -156,11 +203,29 @@ class Calculator:
         # After equals, acc holds result, current already updated
 
 class CalculatorUI(QWidget):
+    BTN_CURSOR = Qt.CursorShape.PointingHandCursor
+
+    # Root stylesheet: parsed once for the whole window.
+    # Buttons are matched by their "role" property (op / func / digit).
+    STYLE_SHEET = """
+        * { background: #000; }
+        QPushButton[role="op"] { background: #f39c12; color: white; border: none; border-radius: 12px; }
+        QPushButton[role="func"] { background: #a5a5a5; color: black; border: none; border-radius: 12px; }
+        QPushButton[role="digit"] { background: #333; color: white; border: none; border-radius: 12px; }
+    """
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Calculator (iPhone-like Layout)")
         self.build_ui()
         self.calculator = Calculator(self.set_display)
+        c = self.calculator
+        # label -> handler, built once (digits are handled separately)
+        self._dispatch = {
+            "AC": c.reset, "±": c.negative_positive, "%": c.percent,
+            "+": c.add, "−": c.subtract, "×": c.multiply, "÷": c.divide,
+            "=": c.equal, ".": c.input_dot,
+        }
 
     def set_display(self, text: str):
         self.display.setText(text)
@@ -197,18 +262,20 @@ class CalculatorUI(QWidget):
             ["0", ".", "="],
         ]
 
+        # One click signal for all buttons (group passes the clicked button)
+        self.buttons = QButtonGroup(self)
+        self.buttons.setExclusive(False)
+        self.buttons.buttonClicked.connect(self._on_button_clicked)
+
+        btn_font = QFont("Segoe UI", 16)  # shared by all buttons
+
         def make_btn(text, role="digit"):
             btn = QPushButton(text)
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setCursor(self.BTN_CURSOR)
             btn.setMinimumHeight(56)
-            btn.setFont(QFont("Segoe UI", 16))
-            if role == "op":
-                btn.setStyleSheet("QPushButton { background: #f39c12; color: white; border: none; border-radius: 12px; }")
-            elif role == "func":
-                btn.setStyleSheet("QPushButton { background: #a5a5a5; color: black; border: none; border-radius: 12px; }")
-            else:
-                btn.setStyleSheet("QPushButton { background: #333; color: white; border: none; border-radius: 12px; }")
-            btn.clicked.connect(lambda _, t=text: self.on_button(t))
+            btn.setFont(btn_font)
+            btn.setProperty("role", role)  # styled via STYLE_SHEET
+            self.buttons.addButton(btn)
             return btn
 
         # Row 1 (functions/operators)
@@ -231,30 +298,18 @@ class CalculatorUI(QWidget):
                 grid.addWidget(make_btn(".", "digit"), idx, 2)
                 grid.addWidget(make_btn("=", "op"), idx, 3)
 
-        self.setStyleSheet("background: #000;")
+        self.setStyleSheet(self.STYLE_SHEET)
         self.setFixedWidth(360)
 
+    def _on_button_clicked(self, btn: QPushButton):
+        self.on_button(btn.text())
+
     def on_button(self, label: str):
-        c = self.calculator
-        if label == "AC":
-            c.reset(); return
-        if label == "±":
-            c.negative_positive(); return
-        if label == "%":
-            c.percent(); return
-        if label in ("+", "−", "×", "÷"):
-            {
-                "+": c.add,
-                "−": c.subtract,
-                "×": c.multiply,
-                "÷": c.divide
-            }[label](); return
-        if label == "=":
-            c.equal(); return
-        if label == ".":
-            c.input_dot(); return
+        fn = self._dispatch.get(label)
+        if fn is not None:
+            fn(); return
         if label.isdigit():
-            c.input_digit(label); return
+            self.calculator.input_digit(label); return
         # Fallback: ignore
 
 def main():
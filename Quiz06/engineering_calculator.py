@@ -5,13 +5,15 @@
 #   (sin, cos, tan, sinh, cosh, tanh, π insert, x², x³) with DEG/RAD toggle
 # - Remaining scientific buttons are visually appended or stubbed (not implemented)
 
-from PyQt6.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLineEdit, QSizePolicy, QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLineEdit, QSizePolicy, QLabel
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
-import sys, math, random
+import sys, math, random, operator
 
 # ---------------- Core Calculator ----------------
 class Calculator:
+    _OPS = {"+": operator.add, "−": operator.sub, "×": operator.mul, "÷": operator.truediv}
+
     def __init__(self, update_display_callback):
         self.update_display = update_display_callback
         self.reset()
@@ -32,7 +34,13 @@ class Calculator:
 
     def _set_current_from_value(self, val: float):
         if math.isfinite(val):
-            text = f"{val:.12g}"
+            iv = int(val)
+            if iv == val and iv and -1_000_000_000 <= iv <= 1_000_000_000:
+                # Common whole-number results (2+2, 3²): plain int text, same as .12g here
+                # (zero stays on format() so -0.0 still shows "-0")
+                text = str(iv)
+            else:
+                text = format(val, ".12g")
         else:
             text = "Error"
         self.current = text
@@ -78,20 +86,12 @@ class Calculator:
     def _apply_pending(self):
         if self.pending_op is None:
             return
+        fn = self._OPS.get(self.pending_op)
+        if fn is None:
+            return
         a, b = self.acc, self._current_value()
         try:
-            if self.pending_op == "+":
-                res = a + b
-            elif self.pending_op == "−":
-                res = a - b
-            elif self.pending_op == "×":
-                res = a * b
-            elif self.pending_op == "÷":
-                if b == 0.0:
-                    raise ZeroDivisionError
-                res = a / b
-            else:
-                return
+            res = fn(a, b)  # float ÷ 0 raises ZeroDivisionError itself
         except ZeroDivisionError:
             self.current = "Error"
             self.acc = 0.0
@@ -161,6 +161,8 @@ class EngineeringCalculator(Calculator):
       - π 삽입
       - x² (square), x³ (cube)
     """
+    _PI_TEXT = format(math.pi, ".12g")  # 상수이므로 한 번만 포맷
+
     def __init__(self, update_display_callback):
         super().__init__(update_display_callback)
         self.is_degree_mode = True  # 기본 Deg
@@ -169,10 +171,17 @@ class EngineeringCalculator(Calculator):
     def _angle(self, x: float) -> float:
         return math.radians(x) if self.is_degree_mode else x
 
+    def _right_angle_index(self, x: float):
+        # DEG 모드에서 x가 90°의 정수배면 사분면 번호(0~3)를, 아니면 None을 반환
+        # (sin 180° = 1.22e-16 같은 오차 없이 정확한 값을 바로 쓰기 위함)
+        if self.is_degree_mode and x.is_integer() and x % 90 == 0:
+            return int(x // 90) % 4
+        return None
+
     # ---- Implemented scientific methods ----
     def insert_pi(self):
         # 현재 입력을 π로 치환 (iOS는 상황 따라 다르지만 단순화)
-        self.current = f"{math.pi:.12g}"
+        self.current = self._PI_TEXT
         self.update_display(self.current)
 
     def square(self):
@@ -184,15 +193,30 @@ class EngineeringCalculator(Calculator):
         self._set_current_from_value(val * val * val)
 
     def sin(self):
-        x = self._angle(self._current_value())
-        self._set_current_from_value(math.sin(x))
+        x = self._current_value()
+        q = self._right_angle_index(x)
+        if q is not None:
+            self._set_current_from_value((0.0, 1.0, 0.0, -1.0)[q]); return
+        self._set_current_from_value(math.sin(self._angle(x)))
 
     def cos(self):
-        x = self._angle(self._current_value())
-        self._set_current_from_value(math.cos(x))
+        x = self._current_value()
+        q = self._right_angle_index(x)
+        if q is not None:
+            self._set_current_from_value((1.0, 0.0, -1.0, 0.0)[q]); return
+        self._set_current_from_value(math.cos(self._angle(x)))
 
     def tan(self):
-        x = self._angle(self._current_value())
+        x = self._current_value()
+        q = self._right_angle_index(x)
+        if q is not None:
+            # 90°, 270° 에서는 정의되지 않음
+            if q % 2:
+                self.current = "Error"; self.update_display(self.current)
+            else:
+                self._set_current_from_value(0.0)
+            return
+        x = self._angle(x)
         try:
             self._set_current_from_value(math.tan(x))
         except Exception:
@@ -216,14 +240,52 @@ class EngineeringCalculator(Calculator):
 
 # -------------- UI ----------------
 class EngineeringCalculatorUI(QWidget):
+    # Root stylesheet: parsed once for the whole window.
+    # Buttons are matched by their "role" property (op / func / digit).
+    STYLE_SHEET = """
+        * { background: #000; }
+        QLineEdit { padding: 12px; border: none; background: #111; color: white; border-radius: 8px; }
+        QPushButton[role="op"] { background: #f39c12; color: white; border: none; border-radius: 10px; }
+        QPushButton[role="func"] { background: #a5a5a5; color: black; border: none; border-radius: 10px; }
+        QPushButton[role="digit"] { background: #333; color: white; border: none; border-radius: 10px; }
+    """
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Engineering Calculator (iPhone-like Landscape)")
         self.build_ui()
+        # Toast overlay: built once, shown/hidden per message (no modal dialog per press)
+        self._toast_label = QLabel(self)
+        self._toast_label.setStyleSheet("background: rgba(60, 60, 60, 230); color: white; padding: 8px; border-radius: 6px;")
+        self._toast_label.setFont(QFont("Segoe UI", 12))
+        self._toast_label.hide()
+        self._toast_timer = QTimer(self)
+        self._toast_timer.setSingleShot(True)
+        self._toast_timer.timeout.connect(self._toast_label.hide)
+        # Cache the bound setter and the last text shown, so repeated identical updates skip Qt
+        self._set_text = self.display.setText
+        self._last_text = self.display.text()
         self.calculator = EngineeringCalculator(self.set_display)
+        c = self.calculator
+        # label -> handler (digits are handled separately since they take the label)
+        self._dispatch = {
+            # Basics
+            "AC": c.reset, "±": c.negative_positive, "%": c.percent,
+            "+": c.add, "−": c.subtract, "×": c.multiply, "÷": c.divide,
+            "=": c.equal, ".": c.input_dot,
+            # Mode toggles
+            "Deg": self._set_deg, "Rad": self._set_rad,
+            # Implemented scientific
+            "π": c.insert_pi, "x²": c.square, "x³": c.cube,
+            "sin": c.sin, "cos": c.cos, "tan": c.tan,
+            "sinh": c.sinh, "cosh": c.cosh, "tanh": c.tanh,
+        }
 
     def set_display(self, text: str):
-        self.display.setText(text)
+        if text == self._last_text:
+            return
+        self._last_text = text
+        self._set_text(text)
 
     def build_ui(self):
         grid = QGridLayout(self)
@@ -237,9 +299,6 @@ class EngineeringCalculatorUI(QWidget):
         self.display.setFont(QFont("Segoe UI", 28))
         self.display.setMaxLength(64)
         self.display.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-        self.display.setStyleSheet("""
-            QLineEdit { padding: 12px; border: none; background: #111; color: white; border-radius: 8px; }
-        """)
         grid.addWidget(self.display, 0, 0, 1, 10)
 
         # Layout rows (10 columns)
@@ -256,12 +315,7 @@ class EngineeringCalculatorUI(QWidget):
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.setMinimumHeight(52)
             btn.setFont(QFont("Segoe UI", 14))
-            if role == "op":
-                btn.setStyleSheet("QPushButton { background: #f39c12; color: white; border: none; border-radius: 10px; }")
-            elif role == "func":
-                btn.setStyleSheet("QPushButton { background: #a5a5a5; color: black; border: none; border-radius: 10px; }")
-            else:
-                btn.setStyleSheet("QPushButton { background: #333; color: white; border: none; border-radius: 10px; }")
+            btn.setProperty("role", role)  # styled via STYLE_SHEET
             btn.clicked.connect(lambda _, t=text: self.on_button(t))
             return btn
 
@@ -294,59 +348,47 @@ class EngineeringCalculatorUI(QWidget):
                 role = "digit" if label.isdigit() or label == "." else ("op" if label in ("=",) else "func")
                 grid.addWidget(make_btn(label, role), r, c)
 
-        self.setStyleSheet("background: #000;")
+        self.setStyleSheet(self.STYLE_SHEET)
         self.setFixedWidth(820)
 
     # -------------- Button wiring --------------
+    # Unimplemented sci keys -> visual append or toast
+    _UNIMPLEMENTED = frozenset({"2nd","x^y","e^x","10^x","1/x","²√x","³√x","y√x","ln","log₁₀","x!","Rand","e","EE","mc","m+","m-","mr","(",")"})
+
     def on_button(self, label: str):
-        c = self.calculator
+        fn = self._dispatch.get(label)
+        if fn is not None:
+            fn(); return
+        if label.isdigit():
+            self.calculator.input_digit(label); return
 
-        # Basics
-        if label == "AC": c.reset(); return
-        if label == "±": c.negative_positive(); return
-        if label == "%": c.percent(); return
-        if label in ("+", "−", "×", "÷"):
-            { "+": c.add, "−": c.subtract, "×": c.multiply, "÷": c.divide }[label](); return
-        if label == "=": c.equal(); return
-        if label == ".": c.input_dot(); return
-        if label.isdigit(): c.input_digit(label); return
-
-        # Mode toggles
-        if label == "Deg": c.set_deg(); self._toast("Degrees mode"); return
-        if label == "Rad": c.set_rad(); self._toast("Radians mode"); return
-
-        # Implemented scientific
-        if label == "π": c.insert_pi(); return
-        if label == "x²": c.square(); return
-        if label == "x³": c.cube(); return
-        if label == "sin": c.sin(); return
-        if label == "cos": c.cos(); return
-        if label == "tan": c.tan(); return
-        if label == "sinh": c.sinh(); return
-        if label == "cosh": c.cosh(); return
-        if label == "tanh": c.tanh(); return
-
-        # Unimplemented sci keys -> visual append or toast
-        unimpl_funcs = {"2nd","x^y","e^x","10^x","1/x","²√x","³√x","y√x","ln","log₁₀","x!","Rand","e","EE","mc","m+","m-","mr","(",")"}
-        if label in unimpl_funcs:
+        if label in self._UNIMPLEMENTED:
             # For clarity, show a one-time toast when first pressed
             self._toast(f"'{label}' not implemented in this assignment")
             # Visual append for feeling (optional):
-            cur = self.display.text()
+            cur = self._last_text
             sep = "" if (not cur or cur.endswith(" ")) else " "
-            self.display.setText(cur + sep + label + " ")
+            self.set_display(cur + sep + label + " ")
             return
 
         # Fallback ignore
         return
 
+    def _set_deg(self):
+        self.calculator.set_deg(); self._toast("Degrees mode")
+
+    def _set_rad(self):
+        self.calculator.set_rad(); self._toast("Radians mode")
+
     def _toast(self, msg: str):
-        # Simple info popup (non-blocking would need timers; keep it modal & brief)
-        box = QMessageBox(self)
-        box.setWindowTitle("Info")
-        box.setText(msg)
-        box.setStandardButtons(QMessageBox.StandardButton.Ok)
-        box.exec()
+        # Brief non-modal message near the bottom of the window; a new toast restarts the timer
+        label = self._toast_label
+        label.setText(msg)
+        label.adjustSize()
+        label.move((self.width() - label.width()) // 2, self.height() - label.height() - 24)
+        label.raise_()
+        label.show()
+        self._toast_timer.start(1200)
 
 def main():
     app = QApplication(sys.argv)
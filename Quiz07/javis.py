@@ -1,7 +1,7 @@
 # javis.py
 # System microphone recorder (saves to ./records/YYYYMMDD-HHMMSS.wav)
-# Dependencies: sounddevice, soundfile
-#   pip install sounddevice soundfile
+# Dependencies: sounddevice, soundfile, numpy
+#   pip install sounddevice soundfile numpy
 #
 # Usage examples:
 #   python javis.py --list                 # list input devices
@@ -13,10 +13,11 @@ from __future__ import annotations
 import argparse
 import sys
 import threading
-import queue
+import time
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import sounddevice as sd
 import soundfile as sf
 
@@ -35,19 +36,73 @@ def list_input_devices() -> None:
             star = "*" if idx == default_in else " "
             print(f"{star} [{idx:>2}] {d['name']}  (in:{d['max_input_channels']}, out:{d['max_output_channels']})")
 
+RING_SECONDS = 60  # capture ring buffer length; the writer may fall this far behind before frames are dropped
+
+class AudioRing:
+    """
+    Preallocated single-producer/single-consumer ring buffer of audio frames.
+    The capture callback copies into it with push() (no allocation on the audio thread);
+    the writer thread drains it into the WAV file with drain_to().
+    head/tail count total frames pushed/drained and only ever grow.
+    """
+    def __init__(self, frames: int, channels: int, dtype: str):
+        self.buf = np.empty((frames, channels), dtype=dtype)
+        self.size = frames
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+        self.ready = threading.Event()
+
+    def push(self, indata) -> None:
+        n = len(indata)
+        if self.head + n - self.tail > self.size:
+            # Writer fell a whole ring behind: drop this block instead of overwriting unread frames
+            self.dropped += n
+            return
+        start = self.head % self.size
+        first = min(n, self.size - start)
+        self.buf[start:start + first] = indata[:first]
+        self.buf[:n - first] = indata[first:]
+        self.head += n  # publish only after the copy
+        self.ready.set()
+
+    def pending(self) -> int:
+        """Frames pushed but not yet drained."""
+        return self.head - self.tail
+
+    def drain_to(self, wav, limit: int | None = None) -> int:
+        """Write every frame pushed so far (at most 'limit') to wav; return the frame count."""
+        n = self.pending()
+        if limit is not None:
+            n = min(n, limit)
+        start = self.tail % self.size
+        first = min(n, self.size - start)
+        # Ring slices are contiguous int16, the same layout as PCM_16, so libsndfile takes them as-is
+        if first:
+            wav.buffer_write(self.buf[start:start + first], dtype="int16")
+        if n > first:
+            wav.buffer_write(self.buf[:n - first], dtype="int16")
+        self.tail += n
+        return n
+
+    def wait(self, timeout: float = 0.1) -> None:
+        """Wait until the callback pushes new frames (or timeout)."""
+        self.ready.wait(timeout)
+        self.ready.clear()
+
 def record_to_file(duration: float | None, device: int | None, samplerate: int, channels: int) -> Path:
     """
     Record audio from the system microphone.
     If duration is None: record until user presses Enter.
     Otherwise: record for 'duration' seconds.
     """
-    q: queue.Queue = queue.Queue()
+    ring = AudioRing(samplerate * RING_SECONDS, channels, "int16")
 
     def cb(indata, frames, time, status):
         if status:
             # Non-fatal warnings (underflow/overflow) printed to stderr
             print(status, file=sys.stderr)
-        q.put(indata.copy())
+        ring.push(indata)
 
     # Prepare filename/path
     filename = f"{timestamp_name()}.wav"
@@ -55,11 +110,40 @@ def record_to_file(duration: float | None, device: int | None, samplerate: int,
 
     # Open audio stream
     with sf.SoundFile(str(filepath), mode="x", samplerate=samplerate, channels=channels, subtype="PCM_16") as wav:
-        with sd.InputStream(samplerate=samplerate, device=device, channels=channels, callback=cb):
+        stop_event = threading.Event()
+        frames_to_write = None if duration is None else int(duration * samplerate)
+        writer_errors: list[Exception] = []
+
+        # Writer thread: the only place that touches the file, so disk stalls never
+        # hold up the capture callback or the main thread
+        def writer():
+            frames_written = 0
+            batch_frames = samplerate // 4  # coalesce callback blocks into >= 250 ms writes
+            try:
+                while not stop_event.is_set():
+                    ring.wait()
+                    limit = None if frames_to_write is None else frames_to_write - frames_written
+                    pending = ring.pending()
+                    if pending < batch_frames and (limit is None or pending < limit):
+                        continue
+                    frames_written += ring.drain_to(wav, limit=limit)
+                    if frames_to_write is not None and frames_written >= frames_to_write:
+                        break
+                # Stopped early (Enter/Ctrl+C): keep what was captured up to now, within the duration
+                limit = None if frames_to_write is None else frames_to_write - frames_written
+                ring.drain_to(wav, limit=limit)
+            except Exception as e:
+                writer_errors.append(e)
+            finally:
+                stop_event.set()
+
+        writer_thread = threading.Thread(target=writer, daemon=True)
+        writer_thread.start()
+
+        with sd.InputStream(samplerate=samplerate, device=device, channels=channels, dtype="int16", callback=cb):
             print(f"Recording...  device={device if device is not None else 'default'}  "
                   f"rate={samplerate}Hz  ch={channels}")
             print(f"Press Enter to stop (or wait {duration}s if provided).")
-            stop_event = threading.Event()
 
             # Stopper thread (Enter key)
             def wait_for_enter():
@@ -73,25 +157,23 @@ def record_to_file(duration: float | None, device: int | None, samplerate: int,
                 t = threading.Thread(target=wait_for_enter, daemon=True)
                 t.start()
 
-            start_time = datetime.now()
+            start_time = time.monotonic()
             try:
-                if duration is None:
-                    # Run until Enter
-                    while not stop_event.is_set():
-                        wav.write(q.get())
-                else:
-                    # Run for fixed duration
-                    frames_to_write = int(duration * samplerate)
-                    frames_written = 0
-                    while frames_written < frames_to_write:
-                        chunk = q.get()
-                        wav.write(chunk)
-                        frames_written += len(chunk)
+                # Main thread only waits: until Enter, or until the writer has the full duration
+                while not stop_event.wait(0.1):
+                    pass
             except KeyboardInterrupt:
                 print("\nInterrupted by user.")
             finally:
-                elapsed = (datetime.now() - start_time).total_seconds()
-                print(f"Saved: {filepath}  (elapsed {elapsed:.1f}s)")
+                stop_event.set()
+                writer_thread.join()
+                elapsed = time.monotonic() - start_time
+                if not writer_errors:
+                    print(f"Saved: {filepath}  (elapsed {elapsed:.1f}s)")
+                if ring.dropped:
+                    print(f"Warning: dropped {ring.dropped} frames (writer fell behind)", file=sys.stderr)
+        if writer_errors:
+            raise writer_errors[0]
 
     return filepath
 
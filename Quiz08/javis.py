@@ -2,14 +2,14 @@
 # Microphone recorder + STT (Vosk) for recorded files.
 # Recording:
 #   - Saves to ./records/YYYYMMDD-HHMMSS.wav
-#   - Dependencies: sounddevice, soundfile
+#   - Dependencies: sounddevice, soundfile, numpy
 # STT:
 #   - Uses Vosk (offline) with a local model path
 #   - Output CSV: same basename as audio, in ./records/, columns = "time_in_file_sec, text"
-#   - Dependencies: vosk
+#   - Dependencies: vosk (optional: orjson, faster parsing of Vosk results)
 #
 # Install:
-#   python -m pip install sounddevice soundfile vosk
+#   python -m pip install sounddevice soundfile numpy vosk
 # Download a Vosk model (example small EN):
 #   https://alphacephei.com/vosk/models
 #   Unzip and pass the folder path via --model or set env VOSK_MODEL_PATH
@@ -23,6 +23,8 @@
 #   python javis.py --duration 5
 #   # Run STT for all WAVs in ./records
 #   python javis.py --stt --model "C:/path/to/vosk-model-small-en-us-0.15"
+#   # ... with 4 files in parallel (each process loads its own copy of the model)
+#   python javis.py --stt --jobs 4 --model "C:/path/to/vosk-model-small-en-us-0.15"
 #   # Run STT for a single file
 #   python javis.py --stt-file ./records/20250822-142355.wav --model "C:/path/to/model"
 #
@@ -30,17 +32,26 @@ from __future__ import annotations
 import argparse
 import sys
 import threading
-import queue
+import time
 from datetime import datetime
 from pathlib import Path
 import os
 import json
 import csv
+from concurrent.futures import ProcessPoolExecutor
 from typing import Iterable, Optional
 
+import numpy as np
 import sounddevice as sd
 import soundfile as sf
 
+try:
+    # Optional: C JSON parser for Vosk results (falls back to the stdlib json module)
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 RECORD_DIR = Path(__file__).resolve().parent / "records"
 RECORD_DIR.mkdir(exist_ok=True)
 
@@ -65,22 +76,105 @@ def list_recordings() -> list[Path]:
         print(p.name)
     return files
 
+RING_SECONDS = 60  # capture ring buffer length; the writer may fall this far behind before frames are dropped
+
+class AudioRing:
+    """
+    Preallocated single-producer/single-consumer ring buffer of audio frames.
+    The capture callback copies into it with push() (no allocation on the audio thread);
+    the writer thread drains it into the WAV file with drain_to().
+    head/tail count total frames pushed/drained and only ever grow.
+    """
+    def __init__(self, frames: int, channels: int, dtype: str):
+        self.buf = np.empty((frames, channels), dtype=dtype)
+        self.size = frames
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+        self.ready = threading.Event()
+
+    def push(self, indata) -> None:
+        n = len(indata)
+        if self.head + n - self.tail > self.size:
+            # Writer fell a whole ring behind: drop this block instead of overwriting unread frames
+            self.dropped += n
+            return
+        start = self.head % self.size
+        first = min(n, self.size - start)
+        self.buf[start:start + first] = indata[:first]
+        self.buf[:n - first] = indata[first:]
+        self.head += n  # publish only after the copy
+        self.ready.set()
+
+    def pending(self) -> int:
+        """Frames pushed but not yet drained."""
+        return self.head - self.tail
+
+    def drain_to(self, wav, limit: Optional[int] = None) -> int:
+        """Write every frame pushed so far (at most 'limit') to wav; return the frame count."""
+        n = self.pending()
+        if limit is not None:
+            n = min(n, limit)
+        start = self.tail % self.size
+        first = min(n, self.size - start)
+        # Ring slices are contiguous int16, the same layout as PCM_16, so libsndfile takes them as-is
+        if first:
+            wav.buffer_write(self.buf[start:start + first], dtype="int16")
+        if n > first:
+            wav.buffer_write(self.buf[:n - first], dtype="int16")
+        self.tail += n
+        return n
+
+    def wait(self, timeout: float = 0.1) -> None:
+        """Wait until the callback pushes new frames (or timeout)."""
+        self.ready.wait(timeout)
+        self.ready.clear()
+
 def record_to_file(duration: Optional[float], device: Optional[int], samplerate: int, channels: int) -> Path:
-    q: queue.Queue = queue.Queue()
+    ring = AudioRing(samplerate * RING_SECONDS, channels, "int16")
 
     def cb(indata, frames, time, status):
         if status:
             print(status, file=sys.stderr)
-        q.put(indata.copy())
+        ring.push(indata)
 
     filename = f"{timestamp_name()}.wav"
     filepath = RECORD_DIR / filename
 
     with sf.SoundFile(str(filepath), mode="x", samplerate=samplerate, channels=channels, subtype="PCM_16") as wav:
-        with sd.InputStream(samplerate=samplerate, device=device, channels=channels, callback=cb):
+        stop_event = threading.Event()
+        frames_to_write = None if duration is None else int(duration * samplerate)
+        writer_errors: list[Exception] = []
+
+        # Writer thread: the only place that touches the file, so disk stalls never
+        # hold up the capture callback or the main thread
+        def writer():
+            frames_written = 0
+            batch_frames = samplerate // 4  # coalesce callback blocks into >= 250 ms writes
+            try:
+                while not stop_event.is_set():
+                    ring.wait()
+                    limit = None if frames_to_write is None else frames_to_write - frames_written
+                    pending = ring.pending()
+                    if pending < batch_frames and (limit is None or pending < limit):
+                        continue
+                    frames_written += ring.drain_to(wav, limit=limit)
+                    if frames_to_write is not None and frames_written >= frames_to_write:
+                        break
+                # Stopped early (Enter/Ctrl+C): keep what was captured up to now, within the duration
+                limit = None if frames_to_write is None else frames_to_write - frames_written
+                ring.drain_to(wav, limit=limit)
+            except Exception as e:
+                writer_errors.append(e)
+            finally:
+                stop_event.set()
+
+        writer_thread = threading.Thread(target=writer, daemon=True)
+        writer_thread.start()
+
+        with sd.InputStream(samplerate=samplerate, device=device, channels=channels, dtype="int16", callback=cb):
             print(f"Recording...  device={device if device is not None else 'default'}  rate={samplerate}Hz  ch={channels}")
             print(f"Press Enter to stop (or wait {duration}s if provided).")
-            stop_event = threading.Event()
 
             def wait_for_enter():
                 try:
@@ -93,56 +187,73 @@ def record_to_file(duration: Optional[float], device: Optional[int], samplerate:
                 t = threading.Thread(target=wait_for_enter, daemon=True)
                 t.start()
 
-            start_time = datetime.now()
+            start_time = time.monotonic()
             try:
-                if duration is None:
-                    while not stop_event.is_set():
-                        wav.write(q.get())
-                else:
-                    frames_to_write = int(duration * samplerate)
-                    frames_written = 0
-                    while frames_written < frames_to_write:
-                        chunk = q.get()
-                        wav.write(chunk)
-                        frames_written += len(chunk)
+                # Main thread only waits: until Enter, or until the writer has the full duration
+                while not stop_event.wait(0.1):
+                    pass
             except KeyboardInterrupt:
                 print("\nInterrupted by user.")
             finally:
-                elapsed = (datetime.now() - start_time).total_seconds()
-                print(f"Saved: {filepath}  (elapsed {elapsed:.1f}s)")
+                stop_event.set()
+                writer_thread.join()
+                elapsed = time.monotonic() - start_time
+                if not writer_errors:
+                    print(f"Saved: {filepath}  (elapsed {elapsed:.1f}s)")
+                if ring.dropped:
+                    print(f"Warning: dropped {ring.dropped} frames (writer fell behind)", file=sys.stderr)
+        if writer_errors:
+            raise writer_errors[0]
 
     return filepath
 
 # ---------------- STT (Vosk) ----------------
-def _load_vosk_model(model_path: Optional[str]):
-    from vosk import Model
+def _resolve_model_path(model_path: Optional[str]) -> str:
     mp = model_path or os.environ.get("VOSK_MODEL_PATH")
     if not mp:
         raise RuntimeError("Vosk model path is required. Use --model or set env VOSK_MODEL_PATH")
     mp = str(Path(mp).expanduser().resolve())
     if not Path(mp).exists():
         raise FileNotFoundError(f"Vosk model path not found: {mp}")
-    return Model(mp)
+    return mp
+
+def _load_vosk_model(model_path: Optional[str]):
+    from vosk import Model
+    return Model(_resolve_model_path(model_path))
+
+# Frames per AcceptWaveform call. Vosk checks for an utterance endpoint only at the end of
+# each call, so this must stay well under the pauses between sentences (8000 ~ 0.2-0.5 s)
+STT_FEED_FRAMES = 8000
 
-def _iter_wav_frames(path: Path, block_size: int = 8000) -> Iterable[bytes]:
-    # Read audio and yield int16 bytes blocks (mono)
+def _iter_wav_frames(path: Path, block_size: Optional[int] = None,
+                     feed_size: int = STT_FEED_FRAMES) -> Iterable[bytes]:
+    # Read audio in large blocks and yield int16 mono bytes in feed_size slices
     with sf.SoundFile(str(path), mode="r") as f:
         samplerate = f.samplerate
         channels = f.channels
-        while True:
-            data = f.read(block_size, dtype="int16", always_2d=True)
-            if len(data) == 0:
-                break
-            # downmix to mono if needed
-            if channels > 1:
-                mono = data.mean(axis=1).astype("int16")
-                yield mono.tobytes()
+        if block_size is None:
+            # ~4 s per read: few soundfile round trips per file
+            block_size = samplerate * 4
+        # Whole number of feed slices per block, so slice boundaries do not depend on block_size
+        block_size = max(1, -(-block_size // feed_size)) * feed_size
+        # One reusable int16 buffer; SoundFile.blocks(out=...) reads every block into it
+        # (no per-block ndarray; the last, shorter block is a view of it)
+        buf = np.empty((block_size, channels), dtype=np.int16)
+        for data in f.blocks(out=buf):
+            # downmix to mono if needed (int32 sum + shift/floor-divide, no float round trip)
+            if channels == 2:
+                mono = ((data[:, 0].astype(np.int32) + data[:, 1]) >> 1).astype(np.int16)
+            elif channels > 2:
+                mono = (data.sum(axis=1, dtype=np.int32) // channels).astype(np.int16)
             else:
-                yield data.tobytes()
+                mono = data
+            for i in range(0, len(mono), feed_size):
+                yield mono[i:i + feed_size].tobytes()
 
-def stt_file_to_csv(audio_path: Path, model_path: Optional[str] = None) -> Path:
+def stt_file_to_csv(audio_path: Path, model_path: Optional[str] = None, model=None) -> Path:
     """
     Transcribe a single WAV file to CSV with columns: time_in_file_sec, text
+    Pass an already loaded Vosk 'model' to skip loading it from model_path.
     """
     from vosk import KaldiRecognizer, SetLogLevel
     SetLogLevel(-1)  # silence Vosk logs
@@ -154,53 +265,83 @@ def stt_file_to_csv(audio_path: Path, model_path: Optional[str] = None) -> Path:
     with sf.SoundFile(str(audio_path), "r") as f:
         samplerate = f.samplerate
 
-    model = _load_vosk_model(model_path)
+    if model is None:
+        model = _load_vosk_model(model_path)
     rec = KaldiRecognizer(model, samplerate)
     rec.SetWords(True)
 
-    segments = []  # (time_sec, text)
-
-    for chunk in _iter_wav_frames(audio_path):
-        if rec.AcceptWaveform(chunk):
-            res = json.loads(rec.Result())
-            text = res.get("text", "").strip()
-            words = res.get("result", [])
-            if text:
-                t0 = words[0]["start"] if words else None
-                segments.append((t0 if t0 is not None else None, text))
-
-    # final partial
-    final = json.loads(rec.FinalResult())
-    text = final.get("text", "").strip()
-    words = final.get("result", [])
-    if text:
-        t0 = words[0]["start"] if words else None
-        segments.append((t0 if t0 is not None else None, text))
-
-    # write CSV
+    # Write each segment as soon as Vosk finalizes it (no transcript kept in memory)
     with out_csv.open("w", newline="", encoding="utf-8-sig") as f:
         w = csv.writer(f)
         w.writerow(["time_in_file_sec", "text"])
-        for t, tx in segments:
-            # Format time as seconds with 2 decimals; None -> 0.00
-            ts = f"{(t if t is not None else 0.0):.2f}"
-            w.writerow([ts, tx])
+
+        def write_segment(result_json: str):
+            res = _json_loads(result_json)
+            text = res.get("text", "").strip()
+            if text:
+                words = res.get("result", [])
+                # Format time as seconds with 2 decimals; no word timing -> 0.00
+                t0 = words[0]["start"] if words else 0.0
+                w.writerow([f"{t0:.2f}", text])
+
+        for chunk in _iter_wav_frames(audio_path):
+            if rec.AcceptWaveform(chunk):
+                write_segment(rec.Result())
+
+        # final partial
+        write_segment(rec.FinalResult())
 
     print(f"STT saved: {out_csv}")
     return out_csv
 
-def stt_all_records(model_path: Optional[str] = None) -> list[Path]:
+# Worker-process state for stt_all_records: each worker loads the model once, then reuses it per file
+_worker_model = None
+
+def _init_stt_worker(model_path: str) -> None:
+    global _worker_model
+    _worker_model = _load_vosk_model(model_path)
+
+def _stt_worker(audio_path: Path) -> Path:
+    return stt_file_to_csv(audio_path, model=_worker_model)
+
+# Each worker process holds its own copy of the Vosk model (1-3 GB for the full-size models),
+# so parallel STT uses only a few workers unless --jobs asks for more
+STT_DEFAULT_JOBS = 2
+
+def stt_all_records(model_path: Optional[str] = None, jobs: int = STT_DEFAULT_JOBS) -> list[Path]:
     files = list(RECORD_DIR.glob("*.wav"))
     if not files:
         print("No WAV files found in ./records")
         return []
+    # Check the model path here so a bad path is reported once, not as a broken pool
+    try:
+        model_path = _resolve_model_path(model_path)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"STT failed: {e}", file=sys.stderr)
+        return []
+    # Files are independent and decoding is CPU-bound: up to 'jobs' worker processes
+    workers = max(1, min(len(files), jobs, os.cpu_count() or 1))
     result_csvs = []
-    for p in files:
+    if workers == 1:
+        # One file (or --jobs 1): no process spawn, and the model is loaded once here
         try:
-            out = stt_file_to_csv(p, model_path=model_path)
-            result_csvs.append(out)
+            model = _load_vosk_model(model_path)
         except Exception as e:
-            print(f"STT failed for {p.name}: {e}", file=sys.stderr)
+            print(f"STT failed: {e}", file=sys.stderr)
+            return []
+        for p in files:
+            try:
+                result_csvs.append(stt_file_to_csv(p, model=model))
+            except Exception as e:
+                print(f"STT failed for {p.name}: {e}", file=sys.stderr)
+        return result_csvs
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_stt_worker, initargs=(model_path,)) as ex:
+        futures = [(p, ex.submit(_stt_worker, p)) for p in files]
+        for p, fut in futures:
+            try:
+                result_csvs.append(fut.result())
+            except Exception as e:
+                print(f"STT failed for {p.name}: {e}", file=sys.stderr)
     return result_csvs
 
 # ---------------- CLI ----------------
@@ -216,6 +357,8 @@ def main():
     parser.add_argument("--stt", action="store_true", help="run STT on all WAVs in ./records")
     parser.add_argument("--stt-file", type=str, default=None, help="run STT on a single WAV file")
     parser.add_argument("--model", type=str, default=None, help="vosk model path (or set VOSK_MODEL_PATH)")
+    parser.add_argument("--jobs", type=int, default=STT_DEFAULT_JOBS,
+                        help=f"parallel STT processes for --stt, each loads its own model (default {STT_DEFAULT_JOBS})")
 
     args = parser.parse_args()
 
@@ -232,7 +375,7 @@ def main():
             audio = Path(args.stt_file)
             stt_file_to_csv(audio, model_path=args.model)
         else:
-            stt_all_records(model_path=args.model)
+            stt_all_records(model_path=args.model, jobs=args.jobs)
         return
 
     # Default: record
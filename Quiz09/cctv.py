@@ -5,38 +5,115 @@
 # Usage:
 #   python cctv.py                      # looks for CCTV.zip next to this script, extracts to ./CCTV
 #   python cctv.py --dir "C:/path/CCTV" # use an existing folder of images
+#   python cctv.py --pillow-info        # also report whether Pillow-SIMD (faster resizing) is in use
 #
 from __future__ import annotations
 import argparse
+import json
+import os
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import sys
+import threading
 import tkinter as tk
-from tkinter import messagebox
+import PIL
 from PIL import Image, ImageTk
 
-SUPPORTED_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+SUPPORTED_EXTS = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".webp"})
+# Lower- and upper-case spellings, so the per-file check is a plain set lookup for the usual names
+_EXT_LOOKUP = SUPPORTED_EXTS | {e.upper() for e in SUPPORTED_EXTS}
+
+CACHE_SIZE = 16  # fitted images kept for instant Left/Right navigation
+# Resize filter for fitting: BILINEAR is several times cheaper than LANCZOS and looks the
+# same at viewer downscale ratios (LANCZOS was the previous default)
+RESAMPLE = Image.BILINEAR
+# Pillow-SIMD (drop-in Pillow fork with SSE4/AVX2 resize loops) versions carry a ".postN" suffix
+PILLOW_SIMD = "post" in PIL.__version__
+PREFETCH_OFFSETS = (1, -1)  # neighbours decoded in the background after each image is shown
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+RESIZE_DEBOUNCE_MS = 120  # redraw once the window has stopped resizing for this long
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 DEFAULT_ZIP = SCRIPT_DIR / "CCTV.zip"
 DEFAULT_OUT = SCRIPT_DIR / "CCTV"
+LIST_CACHE_NAME = ".cache.json"  # image list of an extracted folder, keyed by the zip's mtime/size
+
+def image_members(zf: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+    # Only image members are needed by the viewer
+    members = []
+    for m in zf.infolist():
+        ext = os.path.splitext(m.filename)[1]
+        if not m.is_dir() and (ext in _EXT_LOOKUP or (not ext.islower() and ext.lower() in SUPPORTED_EXTS)):
+            members.append(m)
+    return members
 
 def extract_zip_to_folder(zip_path: Path, out_dir: Path) -> None:
     if not zip_path.exists():
         raise FileNotFoundError(f"ZIP not found: {zip_path}")
     out_dir.mkdir(parents=True, exist_ok=True)
     with zipfile.ZipFile(zip_path, "r") as zf:
-        zf.extractall(out_dir)
+        members = image_members(zf)
+
+    # Inflate + CRC run in C and release the GIL, so members extract in parallel.
+    # Each worker thread opens its own ZipFile instead of sharing one file position.
+    local = threading.local()
+    handles: list[zipfile.ZipFile] = []
+
+    def extract(member: zipfile.ZipInfo) -> None:
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path, "r")
+            handles.append(zf)
+        try:
+            zf.extract(member, out_dir)
+        except FileExistsError:
+            # Another thread created the same parent folder at the same moment; retry once
+            zf.extract(member, out_dir)
+
+    try:
+        with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as ex:
+            list(ex.map(extract, members))  # re-raises the first failure
+    finally:
+        for zf in handles:
+            zf.close()
 
 def collect_images(folder: Path) -> list[Path]:
+    # One recursive pass (os.walk uses scandir, so file/dir type comes without an extra stat);
+    # Path objects are only built for matches
     imgs = []
-    for ext in SUPPORTED_EXTS:
-        imgs.extend(folder.rglob(f"*{ext}"))
-        imgs.extend(folder.rglob(f"*{ext.upper()}"))
-    # Unique & sorted by name
-    imgs = sorted(set(imgs), key=lambda p: p.as_posix().lower())
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            ext = os.path.splitext(name)[1]
+            # Mixed case (".Jpg") still matches; lower() is skipped when it cannot change the answer
+            if ext in _EXT_LOOKUP or (not ext.islower() and ext.lower() in SUPPORTED_EXTS):
+                imgs.append(Path(root, name))
+    # Sorted by name
+    imgs.sort(key=lambda p: p.as_posix().lower())
     return imgs
 
+def zip_stamp(zip_path: Path) -> list[int]:
+    st = zip_path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+def load_image_list(folder: Path, stamp: list[int]) -> list[Path] | None:
+    # Cached collect_images() result, valid only while the zip is unchanged
+    try:
+        data = json.loads((folder / LIST_CACHE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("zip") != stamp:
+        return None
+    return [folder / rel for rel in data.get("images", [])]
+
+def save_image_list(folder: Path, stamp: list[int], images: list[Path]) -> None:
+    data = {"zip": stamp, "images": [p.relative_to(folder).as_posix() for p in images]}
+    try:
+        (folder / LIST_CACHE_NAME).write_text(json.dumps(data), encoding="utf-8")
+    except OSError:
+        pass  # cache is optional
+
 class CCTVViewer(tk.Tk):
     def __init__(self, images: list[Path]):
         super().__init__()
@@ -45,6 +122,7 @@ class CCTVViewer(tk.Tk):
         self.configure(bg="#111111")
         self.images = images
         self.idx = 0
+        self._step = 1  # direction of the last navigation (+1 next, -1 previous)
         self.label = tk.Label(self, bg="#111111")
         self.label.pack(fill=tk.BOTH, expand=True)
         self.bind("<Right>", self.next_image)
@@ -52,6 +130,13 @@ class CCTVViewer(tk.Tk):
         self.bind("<Escape>", lambda e: self.destroy())
         self.bind("<Configure>", self._on_resize)  # redraw on window resize
         self.current_tk_img = None
+        self._resize_after = None  # pending debounced redraw (after id)
+        self._shown_key = None  # (path, box) currently on screen
+        # (path, fitted box) -> PhotoImage, least recently shown first
+        self._cache: OrderedDict[tuple, ImageTk.PhotoImage] = OrderedDict()
+        # Background decode of neighbouring frames (PIL only; PhotoImages are made on the Tk thread)
+        self._loader = ThreadPoolExecutor(max_workers=1)
+        self._pending: dict[tuple, Future] = {}
         self.show_image()
 
     def _fit_image(self, img: Image.Image, max_w: int, max_h: int) -> Image.Image:
@@ -61,44 +146,113 @@ class CCTVViewer(tk.Tk):
         scale = min(max_w / w, max_h / h)
         if scale <= 0:
             return img
+        if scale < 1:
+            # Downscale in place (callers pass their own decoded copy, so no extra allocation);
+            # thumbnail keeps the aspect ratio and pre-shrinks large ratios with reduce()
+            img.thumbnail((max_w, max_h), RESAMPLE)
+            return img
         new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
-        return img.resize(new_size, Image.LANCZOS)
+        return img.resize(new_size, RESAMPLE)
 
     def show_image(self):
         if not self.images:
             self.label.config(text="No images found", fg="white")
             return
-        path = self.images[self.idx]
-        try:
-            img = Image.open(path).convert("RGB")
-            # Fit to current window
-            max_w = self.label.winfo_width() or self.winfo_width()
-            max_h = self.label.winfo_height() or self.winfo_height()
-            img = self._fit_image(img, max_w-20, max_h-20)
-            self.current_tk_img = ImageTk.PhotoImage(img)
+        # Fit to current window
+        max_w = self.label.winfo_width() or self.winfo_width()
+        max_h = self.label.winfo_height() or self.winfo_height()
+        # Box quantized to 10 px so small resizes still hit the cache
+        box = ((max_w - 20) // 10 * 10, (max_h - 20) // 10 * 10)
+        # A file that fails to open is logged and skipped in the direction of travel
+        for _ in range(len(self.images)):
+            path = self.images[self.idx]
+            key = (path, box)
+            if key == self._shown_key and self.current_tk_img is not None:
+                return  # same frame at the same size (e.g. Configure from a focus change)
+            try:
+                tk_img = self._photo_for(key)
+            except Exception as e:
+                print(f"Failed to open {path}: {e}", file=sys.stderr)
+                self.idx = (self.idx + self._step) % len(self.images)
+                continue
+            self.current_tk_img = tk_img
+            self._shown_key = key
             self.label.config(image=self.current_tk_img)
             self.title(f"CCTV Viewer — {path.name}  ({self.idx+1}/{len(self.images)})")
-        except Exception as e:
-            messagebox.showerror("Open Error", f"Failed to open {path}\n{e}")
+            break
+        else:
+            self.current_tk_img = self._shown_key = None
+            self.label.config(image="", text="No readable images", fg="white")
+            return
+        self._prefetch_neighbors(box)
+
+    def _photo_for(self, key: tuple) -> ImageTk.PhotoImage:
+        tk_img = self._cache.get(key)
+        if tk_img is None:
+            fut = self._pending.pop(key, None)
+            img = fut.result() if fut is not None else self._load_fitted(*key)
+            tk_img = ImageTk.PhotoImage(img)
+            self._cache[key] = tk_img
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)  # drop least recently shown
+        else:
+            self._cache.move_to_end(key)
+        return tk_img
+
+    def _load_fitted(self, path: Path, box: tuple[int, int]) -> Image.Image:
+        # Decode + fit one image; pure PIL, so it is safe on the loader thread
+        with Image.open(path) as src:
+            if min(box) > 1:
+                # JPEG: libjpeg decodes straight at 1/2, 1/4 or 1/8 scale (still >= box); no-op otherwise
+                src.draft("RGB", box)
+            img = src.convert("RGB")
+        return self._fit_image(img, *box)
+
+    def _prefetch_neighbors(self, box: tuple[int, int]):
+        if min(box) <= 1:
+            return  # window not laid out yet
+        n = len(self.images)
+        wanted = {(self.images[(self.idx + d) % n], box) for d in PREFETCH_OFFSETS}
+        # Drop prefetches for frames that are no longer next to the current one
+        for key in list(self._pending):
+            if key not in wanted:
+                self._pending.pop(key).cancel()
+        for key in wanted:
+            if key not in self._cache and key not in self._pending:
+                self._pending[key] = self._loader.submit(self._load_fitted, *key)
+
+    def destroy(self):
+        self._loader.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
 
     def next_image(self, event=None):
         if not self.images: return
+        self._step = 1
         self.idx = (self.idx + 1) % len(self.images)
         self.show_image()
 
     def prev_image(self, event=None):
         if not self.images: return
+        self._step = -1
         self.idx = (self.idx - 1) % len(self.images)
         self.show_image()
 
     def _on_resize(self, event):
-        # Redraw current image on resize to keep it fitted
-        self.after(50, self.show_image)
+        # Redraw current image on resize to keep it fitted; a drag fires many Configure
+        # events, so cancel the pending redraw and only run the last one
+        if self._resize_after is not None:
+            self.after_cancel(self._resize_after)
+        self._resize_after = self.after(RESIZE_DEBOUNCE_MS, self._redraw_after_resize)
+
+    def _redraw_after_resize(self):
+        self._resize_after = None
+        self.show_image()
 
 def main():
     parser = argparse.ArgumentParser(description="Extract CCTV.zip and browse images with arrow keys.")
     parser.add_argument("--zip", type=str, default=str(DEFAULT_ZIP), help="Path to CCTV.zip (default: alongside script)")
     parser.add_argument("--dir", type=str, default=None, help="Use existing CCTV directory instead of extracting")
+    parser.add_argument("--pillow-info", action="store_true", help="Print the Pillow build in use (stock or Pillow-SIMD)")
     args = parser.parse_args()
 
     if args.dir:
@@ -106,22 +260,40 @@ def main():
         if not cctv_dir.exists():
             print(f"Directory does not exist: {cctv_dir}")
             sys.exit(1)
+        images = collect_images(cctv_dir)
     else:
         # Extract CCTV.zip -> ./CCTV
+        zip_path = Path(args.zip).expanduser().resolve()
         cctv_dir = DEFAULT_OUT
-        if not cctv_dir.exists():
+        stamp = zip_stamp(zip_path) if zip_path.exists() else None
+        images = load_image_list(cctv_dir, stamp) if stamp else None
+        if images is None:
+            images = collect_images(cctv_dir) if cctv_dir.exists() else []
             try:
-                extract_zip_to_folder(Path(args.zip).expanduser().resolve(), cctv_dir)
-                print(f"Extracted to: {cctv_dir}")
+                if stamp:
+                    with zipfile.ZipFile(zip_path, "r") as zf:
+                        expected = len(image_members(zf))
+                # Missing folder or partial extract (fewer images than the zip holds)
+                if not cctv_dir.exists() or (stamp and len(images) < expected):
+                    extract_zip_to_folder(zip_path, cctv_dir)
+                    print(f"Extracted to: {cctv_dir}")
+                    images = collect_images(cctv_dir)
             except Exception as e:
                 print(f"Extraction failed: {e}")
                 sys.exit(1)
+            if stamp:
+                save_image_list(cctv_dir, stamp, images)
 
-    images = collect_images(cctv_dir)
     if not images:
         print(f"No images found in {cctv_dir}")
         sys.exit(1)
 
+    if args.pillow_info:
+        print(f"Pillow {PIL.__version__} ({'Pillow-SIMD' if PILLOW_SIMD else 'stock build'})", file=sys.stderr)
+        if not PILLOW_SIMD:
+            print("Info: Pillow-SIMD, a separately built Pillow fork, can resize several times faster "
+                  "(it builds from source and may lag Pillow releases)", file=sys.stderr)
+
     app = CCTVViewer(images)
     app.mainloop()
 
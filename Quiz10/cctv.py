@@ -1,31 +1,219 @@
+import argparse
 import cv2
+import json
+import numpy as np
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # 허용 확장자
-VALID_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+VALID_EXTS = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".webp"})
+# 소문자/대문자 표기를 모두 넣어 두어 보통은 .lower() 없이 집합 조회 한 번으로 판정
+_EXT_LOOKUP = VALID_EXTS | {e.upper() for e in VALID_EXTS}
 
 def get_image_files(folder: Path):
     """폴더 및 하위 폴더에서 이미지 파일 목록 가져오기 (재귀)"""
+    # os.walk 한 번으로 순회 (scandir가 파일 여부를 알려 주므로 파일마다 stat 하지 않음)
     files = []
-    for p in folder.rglob("*"):
-        if p.is_file() and p.suffix.lower() in VALID_EXTS:
-            files.append(p)
+    for root, _dirs, names in os.walk(folder):
+        for name in names:
+            ext = os.path.splitext(name)[1]
+            # ".Jpg" 같은 대소문자 혼용도 인식 (이미 소문자면 lower()가 결과를 바꾸지 못하므로 생략)
+            if ext in _EXT_LOOKUP or (not ext.islower() and ext.lower() in VALID_EXTS):
+                files.append(Path(root, name))
     files.sort(key=lambda x: x.as_posix().lower())
     return files
 
-def detect_people(image):
-    """사람 감지 후 박스 그려 반환"""
-    hog = cv2.HOGDescriptor()
-    hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
-    rects, _ = hog.detectMultiScale(image, winStride=(4, 4), padding=(8, 8), scale=1.05)
+def read_image(path):
+    """파일을 한 번에 읽어 메모리에서 디코딩 (열 수 없으면 None)"""
+    # read_bytes는 GIL을 놓는 순수 I/O라 미리 읽기 스레드의 읽기가 메인 스레드 계산과 겹침
+    # (imread와 달리 Windows의 한글 경로도 열림)
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return None
+    if not data:
+        return None
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+# 검출용 축소 폭 (이보다 넓은 이미지는 이 폭으로 줄여서 검출)
+# HOG 검출 창이 64x128이라 축소 후에도 사람 키가 128px 이상이어야 잡힘
+# (예제 1024px 영상의 사람(키 약 170px)이 유지되는 값)
+DETECT_WIDTH = 768
+
+# CPU HOG 검출기: 이미지마다 새로 만들지 않고 한 번만 생성 (SVM 계수 복사도 한 번)
+_HOG = cv2.HOGDescriptor()
+_HOG.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+
+def _create_gpu_hog():
+    """OpenCV CUDA 빌드 + GPU가 있으면 CUDA HOG를 한 번만 만들어 반환, 없으면 None"""
+    try:
+        if cv2.cuda.getCudaEnabledDeviceCount() == 0:
+            return None
+        hog = cv2.cuda.HOG_create()
+        hog.setSVMDetector(hog.getDefaultPeopleDetector())
+        return hog
+    except (AttributeError, cv2.error):
+        # CUDA 모듈이 없는 빌드
+        return None
+
+_GPU_HOG = _create_gpu_hog()
+_GPU_MAT = cv2.cuda_GpuMat() if _GPU_HOG is not None else None  # 업로드용 버퍼 재사용
+
+def _detect_gpu(image, win_stride, scale):
+    """CUDA HOG로 사람 영역 검출 (입력은 그레이스케일 이미지)"""
+    _GPU_HOG.setScaleFactor(scale)
+    # CUDA HOG의 winStride는 블록 간격(8px)의 배수만 가능 -> 아니면 기본값(8, 8) 유지
+    if win_stride[0] % 8 == 0 and win_stride[1] % 8 == 0:
+        _GPU_HOG.setWinStride(win_stride)
+    _GPU_MAT.upload(image)
+    found = _GPU_HOG.detectMultiScale(_GPU_MAT)
+    # 빌드에 따라 rects만 또는 (rects, confidences)를 반환
+    if isinstance(found, tuple) and len(found) == 2:
+        found = found[0]
+    return found
+
+# detectMultiScale 설정: 기본은 정확도 우선, --fast는 창 간격 2배 + 피라미드 단계 약 절반
+# (탐색 창이 약 1/4로 줄어 훨씬 빠르지만 감지 결과가 조금 달라질 수 있음)
+DEFAULT_PARAMS = {"win_stride": (4, 4), "scale": 1.05, "padding": (8, 8)}
+FAST_PARAMS = {"win_stride": (8, 8), "scale": 1.1, "padding": (8, 8)}
+
+def find_people(image, win_stride=(4, 4), scale=1.05, padding=(8, 8)):
+    """사람 영역을 원본 좌표의 [x, y, w, h] 목록으로 반환 (win_stride/scale/padding은 detectMultiScale 설정)"""
+    global _GPU_HOG
+    # 검출은 DETECT_WIDTH 폭으로 줄인 이미지에서 (탐색 윈도 수가 면적에 비례해 줄어듦)
+    h0, w0 = image.shape[:2]
+    ratio = DETECT_WIDTH / w0
+    if ratio < 1.0:
+        small = cv2.resize(image, (DETECT_WIDTH, max(1, round(h0 * ratio))), interpolation=cv2.INTER_LINEAR)
+    else:
+        small, ratio = image, 1.0
+    # HOG에는 그레이스케일 한 채널만 넘김 (3채널 대비 그라디언트 계산량 1/3)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    if _GPU_HOG is not None:
+        try:
+            rects = _detect_gpu(gray, win_stride, scale)
+        except cv2.error as e:
+            # 커널 실행 실패 등 -> 이후로는 CPU HOG 사용
+            print(f"GPU(CUDA) HOG를 사용할 수 없어 CPU로 전환합니다: {e}")
+            _GPU_HOG = None
+    if _GPU_HOG is None:
+        rects, _ = _HOG.detectMultiScale(gray, winStride=win_stride, padding=padding, scale=scale)
+    # 박스는 원본 좌표로 되돌림
+    return [[round(int(v) / ratio) for v in rect] for rect in rects]
+
+def draw_boxes(image, rects):
     for (x, y, w, h) in rects:
         cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
-    return len(rects) > 0, image
+    return image
+
+def detect_people(image, **params):
+    """사람 감지 후 박스 그려 반환"""
+    rects = find_people(image, **params)
+    return len(rects) > 0, draw_boxes(image, rects)
+
+# 감지 결과 캐시: 파일 경로 -> 파일/설정 정보(stamp)와 박스 목록 (같은 파일은 다시 검출하지 않음)
+CACHE_FILE = Path(__file__).resolve().parent / "detections.json"
+
+def load_detections():
+    try:
+        data = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def save_detections(cache):
+    # 임시 파일에 쓴 뒤 교체 (중간에 끊겨도 기존 캐시가 깨지지 않음)
+    tmp = CACHE_FILE.with_name(CACHE_FILE.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps(cache), encoding="utf-8")
+        os.replace(tmp, CACHE_FILE)
+    except OSError as e:
+        print(f"감지 결과 캐시를 저장하지 못했습니다: {e}")
+
+def _file_stamp(path, params):
+    """수정 시각·크기와 검출 설정 (하나라도 바뀌면 캐시 무효), 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, DETECT_WIDTH,
+            list(params["win_stride"]), params["scale"], list(params["padding"])]
+
+def _cached_rects(cache, path, stamp):
+    entry = cache.get(str(path))
+    if stamp is not None and isinstance(entry, dict) and entry.get("stamp") == stamp:
+        return entry["rects"]
+    return None
 
 
-def main(target_folder: str = "."):
+def _init_scan_worker():
+    # 프로세스 하나가 코어 하나를 쓰도록 OpenCV 내부 스레드는 끔 (코어 과다 할당 방지)
+    cv2.setNumThreads(1)
+
+def _detect_file(path: str, params: dict):
+    """파일 하나를 읽어 감지 (열 수 없으면 None, 아니면 박스 목록)"""
+    img = read_image(path)
+    if img is None:
+        return None
+    return find_people(img, **params)
+
+def _print_results(images, results, base_dir: Path):
+    for idx, (path, found) in enumerate(zip(images, results), 1):
+        if found is None:
+            print(f"열 수 없는 파일 건너뜀: {path.name}")
+        elif found:
+            print(f"{idx}/{len(images)}: 사람 감지됨 → {path.relative_to(base_dir)}")
+        else:
+            print(f"{idx}/{len(images)}: 사람 없음 → {path.relative_to(base_dir)}")
+
+def scan_folder(images, base_dir: Path, params: dict = DEFAULT_PARAMS, cache=None):
+    """화면 표시 없이 감지 결과만 출력 (이미지마다 독립이므로 여러 프로세스로 나눠 검사)"""
+    cache = {} if cache is None else cache
+    paths = [str(p) for p in images]
+    stamps = [_file_stamp(p, params) for p in paths]
+    cached = [_cached_rects(cache, p, st) for p, st in zip(paths, stamps)]
+    todo = [p for p, rects in zip(paths, cached) if rects is None]  # 캐시에 없는 파일만 검출
+    detect = partial(_detect_file, params=params)
+
+    def results(fresh):
+        # 캐시에 있으면 바로, 없으면 새로 검출한 결과를 원래 순서대로 내보냄
+        for path, stamp, rects in zip(paths, stamps, cached):
+            if rects is None:
+                rects = next(fresh)
+                if rects is not None and stamp is not None:
+                    cache[path] = {"stamp": stamp, "rects": rects}
+            yield None if rects is None else len(rects) > 0
+
+    if _GPU_HOG is not None or len(todo) <= 1:
+        # GPU는 그 자체로 병렬이고, CUDA 컨텍스트는 fork된 자식 프로세스에서 쓸 수 없음
+        _print_results(images, results(map(detect, todo)), base_dir)
+        return
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_scan_worker) as ex:
+        # 이미지 한 장이 수백 ms라 chunksize=1이어도 전달 비용은 무시할 수준이고 분배는 고르게 됨
+        _print_results(images, results(ex.map(detect, todo)), base_dir)
+
+PREFETCH_DEPTH = 4  # 미리 읽어 둘 이미지 수
+
+def _prefetch_images(images, out: queue.Queue, stop: threading.Event):
+    """images를 순서대로 읽어 (path, img)를 out에 넣고, 끝나면 None을 넣음 (stop이면 중단)"""
+    for path in images:
+        item = (path, read_image(path))
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        if stop.is_set():
+            return
+    out.put(None)
+
+def main(target_folder: str = ".", scan_only: bool = False, fast: bool = False):
     # 스크립트 파일 기준으로 경로 해석 (작업 디렉토리와 무관하게 동작)
     base_dir = Path(__file__).resolve().parent
     folder = (base_dir / target_folder).resolve()
@@ -39,29 +227,62 @@ def main(target_folder: str = "."):
         print(f"이미지 파일이 없습니다. 검색 위치: {folder}")
         sys.exit(1)
 
+    params = FAST_PARAMS if fast else DEFAULT_PARAMS
+    cache = load_detections()
+    if scan_only:
+        print(f"{len(images)}개의 이미지를 검색합니다. (결과만 출력)")
+        try:
+            scan_folder(images, base_dir, params, cache)
+        finally:
+            save_detections(cache)  # 중간에 멈춰도 끝난 만큼은 저장
+        print("모든 사진 검색이 끝났습니다.")
+        return
+
     print(f"{len(images)}개의 이미지를 검색합니다. (Enter를 누르면 다음 사진 진행, ESC 종료)")
 
-    for idx, path in enumerate(images, 1):
-        img = cv2.imread(str(path))
+    # 다음 이미지는 별도 스레드가 미리 읽어 둠 (읽기·디코딩은 GIL을 놓으므로 디스크 I/O와 HOG 계산이 겹침)
+    prefetched = queue.Queue(maxsize=PREFETCH_DEPTH)
+    stop = threading.Event()
+    reader = threading.Thread(target=_prefetch_images, args=(images, prefetched, stop), daemon=True)
+    reader.start()
+
+    idx = 0
+    while True:
+        item = prefetched.get()
+        if item is None:  # 끝 표시
+            break
+        path, img = item
+        idx += 1
         if img is None:
             print(f"열 수 없는 파일 건너뜀: {path.name}")
             continue
 
-        found, out = detect_people(img)
-        if found:
+        stamp = _file_stamp(path, params)
+        rects = _cached_rects(cache, path, stamp)
+        if rects is None:
+            rects = find_people(img, **params)
+            if stamp is not None:
+                cache[str(path)] = {"stamp": stamp, "rects": rects}
+        if rects:
             print(f"{idx}/{len(images)}: 사람 감지됨 → {path.relative_to(base_dir)}")
-            cv2.imshow("Detected Person", out)
+            cv2.imshow("Detected Person", draw_boxes(img, rects))
             key = cv2.waitKey(0)  # 입력 대기
             if key == 27:  # ESC
                 print("강제 종료됨.")
+                stop.set()  # 미리 읽기 스레드도 멈춤
                 break
         else:
             print(f"{idx}/{len(images)}: 사람 없음 → {path.relative_to(base_dir)}")
 
     cv2.destroyAllWindows()
+    save_detections(cache)
     print("모든 사진 검색이 끝났습니다.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="폴더의 이미지에서 사람을 찾아 보여줍니다.")
     # 인자 없으면 현재 폴더(.), 있으면 해당 폴더
-    folder_arg = sys.argv[1] if len(sys.argv) > 1 else "."
-    main(folder_arg)
+    parser.add_argument("folder", nargs="?", default=".", help="검색할 폴더 (스크립트 위치 기준)")
+    parser.add_argument("--scan-only", action="store_true", help="창을 띄우지 않고 감지 결과만 출력 (병렬 검사)")
+    parser.add_argument("--fast", action="store_true", help="빠른 검출 (winStride 8x8, scale 1.1; 결과가 조금 달라질 수 있음)")
+    args = parser.parse_args()
+    main(args.folder, scan_only=args.scan_only, fast=args.fast)